@@ -0,0 +1,92 @@
+import logging
+import threading
+from functools import wraps
+from typing import Optional
+import orjson
+from cachetools import TTLCache
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+logger = logging.getLogger(__name__)
+
+# Per-worker response cache, checked first. Holds entries for at most 60s so
+# workers don't drift far from the shared Redis copy.
+CACHE = TTLCache(maxsize=1024, ttl=60)
+_lock = threading.Lock()
+
+# Shared cache across workers; left as None when REDIS_URL isn't configured
+redis: Optional[Redis] = None
+PREFIX = "sb-api"
+
+
+def init_redis(url: str):
+    global redis
+    # Short timeouts, so an unreachable Redis costs a fraction of a second
+    # (then a RedisError and the database) rather than a TCP timeout
+    redis = Redis.from_url(url, socket_timeout=0.25, socket_connect_timeout=0.25)
+
+
+async def close_redis():
+    global redis
+    if redis is not None:
+        await redis.aclose()
+        redis = None
+
+
+def _params(kwargs):
+    # Query params only (not the db session), with lists made hashable
+    return tuple(sorted(
+        (k, tuple(v) if isinstance(v, list) else v)
+        for k, v in kwargs.items() if k != "db"
+    ))
+
+
+def cached(expire: int = 60, shared: bool = True, cache_if=None):
+    """Cache an endpoint's result, keyed on the endpoint and its query params.
+
+    Results live in the in-process CACHE and, when Redis is configured, in
+    Redis for `expire` seconds as orjson-encoded JSON. With shared=False
+    they are kept in this worker only, for the full `expire`, and Redis is
+    never asked: for small payloads that change over hours, recomputing
+    once per worker is cheaper than a Redis round-trip per request.
+    Fresh results for which `cache_if(result)` is false are returned
+    uncached.
+    """
+    def decorator(func):
+        local = CACHE if shared else TTLCache(maxsize=64, ttl=expire)
+
+        @wraps(func)
+        async def wrapper(**kwargs):
+            params = _params(kwargs)
+            key = (func.__name__, params)
+            with _lock:
+                if key in local:
+                    return local[key]
+
+            redis_key = f"{PREFIX}:{func.__name__}:{orjson.dumps(params).decode()}"
+            if shared and redis is not None:
+                try:
+                    raw = await redis.get(redis_key)
+                except RedisError:
+                    logger.warning("Redis GET failed, falling back to the database", exc_info=True)
+                    raw = None
+                if raw is not None:
+                    result = orjson.loads(raw)
+                    with _lock:
+                        local[key] = result
+                    return result
+
+            result = await func(**kwargs)
+            if cache_if is not None and not cache_if(result):
+                return result
+            with _lock:
+                local[key] = result
+            if shared and redis is not None:
+                try:
+                    # default=dict covers SQLAlchemy RowMapping results
+                    await redis.set(redis_key, orjson.dumps(result, default=dict), ex=expire)
+                except RedisError:
+                    logger.warning("Redis SET failed", exc_info=True)
+            return result
+        return wrapper
+    return decorator
\ No newline at end of file
@@ -0,0 +1,27 @@
+import os
+
+# Adjust this factor to scale volume impact in your profitability formula
+# tweak these as you like (or override them from the environment)
+CAPITAL = int(os.getenv("CAPITAL", 1_000_000_000))         # 1 billion coins bankroll
+MARKET_SHARE = float(os.getenv("MARKET_SHARE", 0.10))      # assume you can capture 10% of weekly volume
+SCALING_FACTOR = int(os.getenv("SCALING_FACTOR", 1))       # keep revenue in raw coins
+
+# Comma-separated list of allowed browser origins (spaces around commas are fine)
+CORS_ORIGINS = [
+    origin.strip()
+    for origin in os.getenv(
+        "CORS_ORIGINS",
+        "http://localhost:3000,"
+        "http://192.168.0.160:3000,"
+        "https://bazaar-data.up.railway.app,"
+        "https://pulsion-apiv1.up.railway.app",
+    ).split(",")
+    if origin.strip()
+]
+
+# Seconds between refreshes of the bazaar_latest view behind /top; 0 disables
+# the in-app refresh (e.g. when a cron job does it instead)
+LATEST_REFRESH_SECONDS = float(os.getenv("LATEST_REFRESH_SECONDS", 60))
+
+# Shared response cache; without it each worker only caches in-process
+REDIS_URL = os.getenv("REDIS_URL")
\ No newline at end of file
@@ -0,0 +1,5 @@
+-- Store bazaar snapshots as binary JSONB instead of text JSON so key lookups
+-- don't re-parse the whole document on every row.
+ALTER TABLE bazaar ALTER COLUMN data TYPE jsonb USING data::jsonb;
+
+CREATE INDEX IF NOT EXISTS bazaar_data_gin ON bazaar USING GIN (data jsonb_path_ops);
@@ -0,0 +1,12 @@
+-- Promote the hot bazaar fields to stored generated columns. Adding them
+-- rewrites the table once, which also backfills existing rows.
+ALTER TABLE bazaar
+    ADD COLUMN sell_price       float8 GENERATED ALWAYS AS ((data->>'sellPrice')::float8) STORED,
+    ADD COLUMN buy_price        float8 GENERATED ALWAYS AS ((data->>'buyPrice')::float8) STORED,
+    ADD COLUMN sell_volume      float8 GENERATED ALWAYS AS ((data->>'sellVolume')::float8) STORED,
+    ADD COLUMN buy_volume       float8 GENERATED ALWAYS AS ((data->>'buyVolume')::float8) STORED,
+    ADD COLUMN sell_moving_week float8 GENERATED ALWAYS AS ((data->>'sellMovingWeek')::float8) STORED,
+    ADD COLUMN buy_moving_week  float8 GENERATED ALWAYS AS ((data->>'buyMovingWeek')::float8) STORED;
+
+CREATE INDEX IF NOT EXISTS ix_bazaar_sell_price ON bazaar (sell_price);
+CREATE INDEX IF NOT EXISTS ix_bazaar_buy_price ON bazaar (buy_price);
@@ -0,0 +1,7 @@
+-- One (product_id, timestamp) index serves the per-item lookups in /sold,
+-- /prices and /top (scanned backwards for ORDER BY timestamp DESC).
+-- CONCURRENTLY cannot run inside a transaction block: run with autocommit.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_bazaar_pid_ts ON bazaar (product_id, timestamp);
+
+DROP INDEX CONCURRENTLY IF EXISTS ix_bazaar_product_id;
+DROP INDEX CONCURRENTLY IF EXISTS ix_bazaar_timestamp;
@@ -0,0 +1,10 @@
+-- Latest snapshot per product, so /top doesn't sort the whole bazaar table
+-- on every request. The API refreshes it in the background (see
+-- db/refresh.py); the unique index is what allows REFRESH ... CONCURRENTLY.
+CREATE MATERIALIZED VIEW IF NOT EXISTS bazaar_latest AS
+SELECT DISTINCT ON (product_id)
+       product_id, timestamp, sell_price, buy_price, sell_moving_week
+FROM bazaar
+ORDER BY product_id, timestamp DESC;
+
+CREATE UNIQUE INDEX IF NOT EXISTS ix_bazaar_latest_product_id ON bazaar_latest (product_id);
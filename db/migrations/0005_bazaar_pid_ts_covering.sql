@@ -0,0 +1,7 @@
+-- Carry the generated price/volume columns in the (product_id, timestamp)
+-- index so the series endpoints can be answered by index-only scans.
+-- CONCURRENTLY cannot run inside a transaction block: run with autocommit.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_bazaar_pid_ts_incl ON bazaar (product_id, timestamp)
+    INCLUDE (sell_price, buy_price, sell_volume, buy_volume);
+
+DROP INDEX CONCURRENTLY IF EXISTS ix_bazaar_pid_ts;
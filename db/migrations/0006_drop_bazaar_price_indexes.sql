@@ -0,0 +1,6 @@
+-- Nothing filters or sorts on sell_price/buy_price (the series read them
+-- from the covering pid/timestamp index, /top ranks from bazaar_latest), so
+-- their B-tree indexes were pure write cost on every snapshot insert.
+-- CONCURRENTLY cannot run inside a transaction block: run with autocommit.
+DROP INDEX CONCURRENTLY IF EXISTS ix_bazaar_sell_price;
+DROP INDEX CONCURRENTLY IF EXISTS ix_bazaar_buy_price;
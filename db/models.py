@@ -1,4 +1,5 @@
-from sqlalchemy import Column, Integer, String, DateTime, JSON
+from sqlalchemy import Column, Integer, String, DateTime, Float, Index, Computed
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import declarative_base
 from db.session import engine
 
@@ -6,13 +7,40 @@ Base = declarative_base()
 
 class Bazaar(Base):
     __tablename__ = 'bazaar'
+    __table_args__ = (
+        Index('ix_bazaar_pid_ts_incl', 'product_id', 'timestamp',
+              postgresql_include=['sell_price', 'buy_price', 'sell_volume', 'buy_volume']),
+        Index('bazaar_data_gin', 'data', postgresql_using='gin',
+              postgresql_ops={'data': 'jsonb_path_ops'}),
+    )
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
-    product_id = Column(String, index=True)
-    timestamp = Column(DateTime, index=True)
-    data = Column(JSON)
+    product_id = Column(String)
+    timestamp = Column(DateTime)
+    data = Column(JSONB)
+
+    # Hot price/volume fields, extracted from `data` once at write time
+    sell_price = Column(Float, Computed("(data->>'sellPrice')::float8", persisted=True))
+    buy_price = Column(Float, Computed("(data->>'buyPrice')::float8", persisted=True))
+    sell_volume = Column(Float, Computed("(data->>'sellVolume')::float8", persisted=True))
+    buy_volume = Column(Float, Computed("(data->>'buyVolume')::float8", persisted=True))
+    sell_moving_week = Column(Float, Computed("(data->>'sellMovingWeek')::float8", persisted=True))
+    buy_moving_week = Column(Float, Computed("(data->>'buyMovingWeek')::float8", persisted=True))
     
 class Election(Base):
     __tablename__ = 'elections'
     year = Column(Integer, primary_key=True, index=True)
     mayor = Column(String)
-    timestamp = Column(DateTime)
\ No newline at end of file
+    timestamp = Column(DateTime)
+
+# Views get their own metadata, so Base.metadata.create_all() never creates
+# them as plain tables (which would make their migration's IF NOT EXISTS skip)
+ViewBase = declarative_base()
+
+class BazaarLatest(ViewBase):
+    # Materialized view (db/migrations/0004), read-only: latest Bazaar row per product
+    __tablename__ = 'bazaar_latest'
+    product_id = Column(String, primary_key=True)
+    timestamp = Column(DateTime)
+    sell_price = Column(Float)
+    buy_price = Column(Float)
+    sell_moving_week = Column(Float)
\ No newline at end of file
@@ -0,0 +1,24 @@
+import asyncio
+import logging
+from sqlalchemy import text
+from db.session import engine
+
+logger = logging.getLogger(__name__)
+
+
+async def refresh_bazaar_latest():
+    async with engine.begin() as conn:
+        # Every worker runs this loop; whoever gets the lock refreshes, the rest skip
+        if not await conn.scalar(text("SELECT pg_try_advisory_xact_lock(hashtext('bazaar_latest'))")):
+            return
+        await conn.execute(text("SET LOCAL statement_timeout = 0"))
+        await conn.execute(text("REFRESH MATERIALIZED VIEW CONCURRENTLY bazaar_latest"))
+
+
+async def refresh_periodically(interval: float):
+    while True:
+        try:
+            await refresh_bazaar_latest()
+        except Exception:
+            logger.exception("Refreshing bazaar_latest failed")
+        await asyncio.sleep(interval)
\ No newline at end of file
@@ -1,13 +1,61 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from uuid import uuid4
+import logging
 import os
 
-DATABASE_URL = os.getenv("DATABASE_URL",
-    'DATABASE_URL')
+DATABASE_URL = os.environ["DATABASE_URL"]
+SQL_ECHO = os.getenv("SQL_ECHO") == "1"
+# Connections per worker process; across all workers, workers x (pool size
+# + max overflow) has to stay under the server's max_connections
+POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "20"))
+MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "40"))
+# Prepared statements kept per connection
+STATEMENT_CACHE_SIZE = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "500"))
+# A transaction-pooling pgbouncer hands each transaction a different server
+# connection, so cached statements go missing and reused names collide
+PGBOUNCER = os.getenv("DB_PGBOUNCER") == "1"
 
-# Create engine
-engine = create_engine(DATABASE_URL, pool_pre_ping=True, echo=True)
+# Milliseconds any statement may run before Postgres cancels it
+STATEMENT_TIMEOUT_MS = 15000
 
-print("Connecting to:", DATABASE_URL)
+connect_args = {
+    "server_settings": {"statement_timeout": str(STATEMENT_TIMEOUT_MS)},
+    "prepared_statement_cache_size": STATEMENT_CACHE_SIZE,
+}
+if PGBOUNCER:
+    # pgbouncer refuses startup parameters other than a few client settings,
+    # so the timeout is set per transaction instead (see below)
+    del connect_args["server_settings"]
+    connect_args.update(
+        prepared_statement_cache_size=0,
+        statement_cache_size=0,
+        prepared_statement_name_func=lambda: f"__asyncpg_{uuid4()}__",
+    )
+
+# Create engine; whatever driver the URL names, talk to Postgres via asyncpg
+engine = create_async_engine(
+    make_url(DATABASE_URL).set(drivername="postgresql+asyncpg"),
+    pool_pre_ping=True,
+    pool_size=POOL_SIZE,
+    max_overflow=MAX_OVERFLOW,
+    pool_recycle=1800,
+    pool_timeout=10,
+    # Reuse the most recently returned connection so idle extras age out
+    pool_use_lifo=True,
+    connect_args=connect_args,
+    query_cache_size=1200,
+    echo=SQL_ECHO,
+)
+
+if PGBOUNCER:
+    @event.listens_for(engine.sync_engine, "begin")
+    def set_statement_timeout(conn):
+        # SET LOCAL lasts for this transaction only, so it holds whichever
+        # server connection pgbouncer picks; db/refresh.py overrides it
+        conn.exec_driver_sql(f"SET LOCAL statement_timeout = {STATEMENT_TIMEOUT_MS}")
+
+logging.getLogger(__name__).info("Connecting to %s", engine.url.render_as_string(hide_password=True))
 # Session factory
-SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
\ No newline at end of file
+SessionLocal = async_sessionmaker(bind=engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
\ No newline at end of file
@@ -0,0 +1,57 @@
+from fastapi import Query
+from datetime import datetime, timedelta, timezone
+from typing import Literal, Optional, Tuple
+from db.session import SessionLocal
+
+
+async def get_db():
+    async with SessionLocal() as db:
+        yield db
+
+
+def utcnow() -> datetime:
+    # The timestamp columns are naive UTC, and asyncpg refuses to bind an
+    # aware datetime against them.
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def naive_utc(dt: Optional[datetime]) -> Optional[datetime]:
+    if dt is not None and dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return dt
+
+
+_RANGE = {
+    '6months': timedelta(days=180),
+    '2months': timedelta(days=60),
+    '1week':   timedelta(weeks=1),
+    '1day':    timedelta(days=1),
+    '1hour':   timedelta(hours=1),
+    'latest':  timedelta(hours=2),
+    'all':     None
+}
+Range = Literal['all', '6months', '2months', '1week', '1day', '1hour', 'latest']
+RANGE_HELP = ",".join(_RANGE)
+
+parse_range = _RANGE.get
+
+Window = Tuple[Optional[datetime], datetime]
+
+
+def time_window(range: Range = Query('1week', description=RANGE_HELP)) -> Window:
+    """
+    The (start, end) of `range` ending now. `end` is rounded up to the next
+    minute, so repeated requests within a minute share one cache key.
+    """
+    end = utcnow().replace(second=0, microsecond=0) + timedelta(minutes=1)
+    td = parse_range(range)
+    return (None if td is None else end - td), end
+
+
+def apply_time_filters(stmt, field, start, end):
+    # `stmt` is a lambda_stmt; start/end are picked up as bound parameters
+    if start:
+        stmt += lambda s: s.where(field >= start)
+    if end:
+        stmt += lambda s: s.where(field <= end)
+    return stmt
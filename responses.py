@@ -0,0 +1,58 @@
+from fastapi import Request
+from fastapi.responses import JSONResponse, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Any, List
+import hashlib
+import orjson
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered by orjson, which also encodes datetimes natively."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content)
+
+
+# Responses that carry an ETag can be revalidated, so they may be reused
+# a little longer than the default
+REVALIDATE_CACHE_CONTROL = "public, max-age=60"
+
+
+def not_modified(request: Request, etag: str) -> bool:
+    """Whether `etag` matches the request's If-None-Match (weak comparison)."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    tags = {t.strip().removeprefix("W/") for t in header.split(",")}
+    return etag.removeprefix("W/") in tags
+
+
+def conditional_json(request: Request, content: Any) -> Response:
+    """Render `content` with an ETag from its bytes, or 304 if the client has it."""
+    response = ORJSONResponse(content, headers={"Cache-Control": REVALIDATE_CACHE_CONTROL})
+    etag = f'W/"{hashlib.blake2b(response.body, digest_size=8).hexdigest()}"'
+    if not_modified(request, etag):
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": REVALIDATE_CACHE_CONTROL})
+    response.headers["ETag"] = etag
+    return response
+
+
+async def stream_rows(db: AsyncSession, columns: List[str], first, partitions, limit: int):
+    """
+    Stream result partitions as {"columns": [...], "rows": [[...], ...], "next": ...},
+    closing `db` when done. `next` is the first column of the first row when
+    the page is full (`limit` rows), else null.
+    """
+    try:
+        yield orjson.dumps({"columns": columns})[:-1] + b',"rows":['
+        chunk, sep, count = first, b"", 0
+        while chunk:
+            # One orjson call per partition, minus its enclosing brackets
+            yield sep + orjson.dumps([tuple(row) for row in chunk])[1:-1]
+            count += len(chunk)
+            chunk, sep = await anext(partitions, None), b","
+        yield b'],"next":' + orjson.dumps(first[0][0] if count == limit else None) + b"}"
+    finally:
+        await db.close()
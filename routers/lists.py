@@ -0,0 +1,53 @@
+from fastapi import APIRouter, Depends, Query, Request
+from sqlalchemy import select, lambda_stmt
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime
+from typing import List, Optional, Dict, Any
+from db.models import BazaarLatest, Election
+from cache import cached
+from deps import get_db, naive_utc, time_window, apply_time_filters, Range, RANGE_HELP
+from responses import conditional_json
+
+router = APIRouter()
+
+
+@router.get("/elections", summary="List mayoral elections")
+async def get_elections(
+    request: Request,
+    range: Range = Query('1week', description=RANGE_HELP),
+    limit: int = Query(5000, ge=1, le=50000, description="Maximum elections per page"),
+    after: Optional[datetime] = Query(None, description="Only elections after this timestamp (the last one of the previous page)"),
+    db: AsyncSession = Depends(get_db)
+) -> List[Dict[str, Any]]:
+    return conditional_json(request, await fetch_elections(range=range, limit=limit, after=after, db=db))
+
+
+# Elections change a few times a week: keyed on the range name rather than
+# the per-minute window, so repeat requests hit for the whole hour
+@cached(expire=3600, shared=False)
+async def fetch_elections(range: str, limit: int, after: Optional[datetime], db: AsyncSession) -> List[Dict[str, Any]]:
+    start, end = time_window(range)
+    after = naive_utc(after)
+    q = lambda_stmt(lambda: select(Election.year, Election.mayor, Election.timestamp))
+    q = apply_time_filters(q, Election.timestamp, start, end)
+    if after:
+        q += lambda s: s.where(Election.timestamp > after)
+    q += lambda s: s.order_by(Election.timestamp).limit(limit)
+    rows = (await db.execute(q)).all()
+    return [{"year": y, "mayor": m, "timestamp": t} for y,m,t in rows]
+
+
+@router.get("/items", summary="Aggregate tracked item IDs")
+async def list_items(request: Request, db: AsyncSession = Depends(get_db)) -> List[str]:
+    return conditional_json(request, await fetch_items(db=db))
+
+
+# bazaar_latest holds one row per product, so no DISTINCT over every
+# snapshot; COLLATE "C" keeps plain codepoint order, whatever the locale
+_product_id = BazaarLatest.product_id.collate("C")
+ITEMS_STMT = select(_product_id).order_by(_product_id)
+
+
+@cached(expire=3600, shared=False)
+async def fetch_items(db: AsyncSession) -> List[str]:
+    return (await db.scalars(ITEMS_STMT)).all()
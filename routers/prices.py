@@ -0,0 +1,278 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import Response, StreamingResponse
+from sqlalchemy import select, bindparam, func, cast, desc, DateTime, Integer, REAL
+from sqlalchemy.dialects.postgresql import ARRAY, TEXT
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Dict, Any
+from array import array
+from math import nan
+import sys
+from db.session import SessionLocal
+from db.models import Bazaar
+from cache import cached
+from deps import get_db, naive_utc, time_window, Range, RANGE_HELP, Window
+from responses import ORJSONResponse, REVALIDATE_CACHE_CONTROL, not_modified, stream_rows
+
+router = APIRouter()
+
+
+# Fixed-shape statements are built once at import; only their bound
+# parameters change per request
+LATEST_TIMESTAMP_STMT = select(func.max(Bazaar.timestamp)).where(Bazaar.product_id == bindparam("item_id"))
+SOLD_STMT = (
+    select(Bazaar.data.label('data'))
+    .where(Bazaar.product_id == bindparam("item_id"))
+    .order_by(Bazaar.timestamp.desc())
+    .limit(1)
+)
+
+
+def epoch(dt: datetime) -> int:
+    # Naive UTC timestamp as Unix seconds
+    return int(dt.replace(tzinfo=timezone.utc).timestamp())
+
+
+@router.get("/prices/{item_id}", summary="Time series bazaar data")
+async def get_prices(
+    request: Request,
+    item_id: str,
+    range: Range = Query('1week', description=RANGE_HELP),
+    window: Window = Depends(time_window),
+    limit: int = Query(5000, ge=1, le=50000, description="Maximum rows per page"),
+    before: Optional[datetime] = Query(None, description="Only rows before this timestamp (the previous page's `next`)"),
+) -> Dict[str, Any]:
+    """
+    Pages run from the newest end: each holds the newest `limit` rows before
+    `before`, in ascending order, so a client that never follows `next`
+    still gets the most recent data.
+    """
+    start, end = window
+    before = naive_utc(before)
+
+    conditions = [Bazaar.product_id == item_id, Bazaar.timestamp <= end]
+    if before:
+        conditions.append(Bazaar.timestamp < before)
+    page = (
+        select(Bazaar.timestamp, Bazaar.data.label('data'))
+        .where(*conditions, *([Bazaar.timestamp >= start] if start else []))
+        .order_by(Bazaar.timestamp.desc())
+        .limit(limit)
+        .subquery()
+    )
+    q = select(page.c.timestamp, page.c.data).order_by(page.c.timestamp)
+
+    # The session has to outlive this function while the body streams, so
+    # it is owned by the stream rather than by get_db.
+    db = SessionLocal()
+    try:
+        # The newest snapshot validates the page: a client holding it gets a
+        # 304 from one index lookup instead of the whole series
+        latest = await db.scalar(LATEST_TIMESTAMP_STMT, {"item_id": item_id})
+        if latest is None:
+            raise HTTPException(404, f"No bazaar data for item {item_id}")
+        # A full page is just the newest `limit` rows before `before`; only
+        # a short one is trimmed by the sliding window start. `end` is at or
+        # past the newest snapshot, so it never changes the rows.
+        trimmed_by = start
+        if start:
+            floor = await db.scalar(
+                select(Bazaar.timestamp).where(*conditions)
+                .order_by(Bazaar.timestamp.desc()).offset(limit - 1).limit(1)
+            )
+            if floor is not None and floor >= start:
+                trimmed_by = None
+        # Tag everything that selects the rows: the page (limit, before), the
+        # start when it trims the page, and the newest snapshot
+        tag = "-".join(
+            [item_id, range, str(limit)]
+            + [str(epoch(t)) if t else "" for t in (trimmed_by, before, latest)]
+        )
+        headers = {"ETag": f'W/"{tag}"', "Cache-Control": REVALIDATE_CACHE_CONTROL}
+        if not_modified(request, headers["ETag"]):
+            await db.close()
+            return Response(status_code=304, headers=headers)
+
+        partitions = (await db.stream(q, execution_options={"yield_per": 1000})).partitions()
+        first = await anext(partitions, None)
+    except BaseException:
+        await db.close()
+        raise
+
+    # An empty page past the last one is not a missing item
+    if first is None and before is None:
+        await db.close()
+        raise HTTPException(404, f"No bazaar data for item {item_id}")
+
+    return StreamingResponse(
+        stream_rows(db, ["timestamp", "data"], first, partitions, limit),
+        media_type="application/json",
+        headers=headers,
+    )
+
+
+# Long ranges of scalar series are averaged into buckets of this width in
+# SQL (unless raw=true); shorter ranges always return every sample
+_BUCKET = {
+    'all':     timedelta(days=1),
+    '6months': timedelta(days=1),
+    '2months': timedelta(hours=1),
+    '1week':   timedelta(minutes=5),
+}
+_BUCKET_ORIGIN = datetime(2000, 1, 1)
+RAW_HELP = "Return every sample instead of bucket averages for ranges of a week or more"
+
+
+def series_bucket(range: str, raw: bool) -> Optional[timedelta]:
+    return None if raw else _BUCKET.get(range)
+
+
+def bucket_start(bucket: timedelta):
+    return func.date_bin(bucket, Bazaar.timestamp, _BUCKET_ORIGIN, type_=DateTime)
+
+
+# Binding the item list as one array parameter keeps a single SQL string
+# and prepared statement for every list length; IN would render (and
+# prepare) a placeholder per item
+_ITEM_IDS = ARRAY(TEXT())
+
+SERIES_FIELDS = ("sell_price", "buy_price", "sell_volume", "buy_volume")
+_SERIES_COLUMNS = (
+    cast(func.extract("epoch", Bazaar.timestamp), Integer).label("ts"),
+    *(cast(getattr(Bazaar, f), REAL).label(f) for f in SERIES_FIELDS),
+)
+
+# Row caps for the scalar series: a point is 20 bytes in /bin, so its cap
+# is 2MB; bulk /prices caps each of up to 50 items
+BIN_MAX_POINTS = 100_000
+BULK_MAX_POINTS = 5000
+# Bulk results beyond this many points are served but not cached
+BULK_CACHE_MAX_POINTS = 20_000
+
+
+def series_page(columns, item_id, start: Optional[datetime], end: datetime, bucket: Optional[timedelta], limit: int):
+    """
+    The newest `limit` points of one item's series in [start, end], newest
+    first: raw samples, or averages per `bucket`. `columns` must label the
+    point's time "ts".
+    """
+    q = select(*columns).where(Bazaar.product_id == item_id, Bazaar.timestamp <= end)
+    if start:
+        q = q.where(Bazaar.timestamp >= start)
+    if bucket is None:
+        q = q.order_by(Bazaar.timestamp.desc())
+    else:
+        q = q.group_by("ts").order_by(desc("ts"))
+    return q.limit(limit)
+
+
+@router.get("/prices/{item_id}/bin", response_class=Response, summary="Packed binary bazaar time series")
+async def get_prices_binary(
+    item_id: str,
+    range: Range = Query('1week', description=RANGE_HELP),
+    window: Window = Depends(time_window),
+    raw: bool = Query(False, description=RAW_HELP),
+    limit: int = Query(BIN_MAX_POINTS, ge=1, le=BIN_MAX_POINTS, description="Maximum points; the newest are kept"),
+    db: AsyncSession = Depends(get_db)
+) -> Response:
+    """
+    Little-endian arrays, back to back: N int32 Unix timestamps, then N
+    float32 values for each of `X-Series-Fields` after `timestamp`.
+    Missing values are NaN. Long ranges are bucket averages, stamped with
+    the bucket start. At most `limit` points, the newest.
+    """
+    start, end = window
+    bucket = series_bucket(range, raw)
+
+    # real (float4) is cast in SQL so half the bytes cross the wire too
+    if bucket is None:
+        columns = _SERIES_COLUMNS
+    else:
+        columns = (
+            cast(func.extract("epoch", bucket_start(bucket)), Integer).label("ts"),
+            *(cast(func.avg(getattr(Bazaar, f)), REAL).label(f) for f in SERIES_FIELDS),
+        )
+    page = series_page(columns, item_id, start, end, bucket, limit).subquery()
+    q = select(*page.c).order_by(page.c.ts)
+
+    # Fill the packed arrays partition by partition, so a long range never
+    # holds more than one partition of Row objects at a time
+    arrays = [array("i")] + [array("f") for _ in SERIES_FIELDS]
+    result = await db.stream(q, execution_options={"yield_per": 5000})
+    async for chunk in result.partitions():
+        timestamps, *series = zip(*chunk)
+        arrays[0].extend(timestamps)
+        for a, values in zip(arrays[1:], series):
+            a.extend(nan if v is None else v for v in values)
+
+    if not arrays[0]:
+        raise HTTPException(404, f"No bazaar data for item {item_id}")
+
+    if sys.byteorder == "big":
+        for a in arrays:
+            a.byteswap()
+
+    return Response(
+        content=b"".join(a.tobytes() for a in arrays),
+        media_type="application/octet-stream",
+        headers={
+            "X-Series-Fields": ",".join(("timestamp",) + SERIES_FIELDS),
+            "X-Series-Length": str(len(arrays[0])),
+        },
+    )
+
+
+@router.get("/prices", summary="Time series prices for several items at once")
+async def get_prices_bulk(
+    items: List[str] = Query(..., max_length=50, description="Item IDs; repeat the parameter for each item (max 50)"),
+    range: Range = Query('1week', description=RANGE_HELP),
+    window: Window = Depends(time_window),
+    raw: bool = Query(False, description=RAW_HELP),
+    limit: int = Query(2500, ge=1, le=BULK_MAX_POINTS, description="Maximum points per item; the newest are kept"),
+    db: AsyncSession = Depends(get_db)
+) -> Dict[str, Any]:
+    # Returned as a Response so FastAPI skips validating every point
+    # against the return annotation; orjson renders it directly
+    return ORJSONResponse(await fetch_prices_bulk(items=items, range=range, window=window, raw=raw, limit=limit, db=db))
+
+
+def _cacheable_bulk(result: Dict[str, Any]) -> bool:
+    return sum(map(len, result["rows"].values())) <= BULK_CACHE_MAX_POINTS
+
+
+@cached(expire=300, cache_if=_cacheable_bulk)
+async def fetch_prices_bulk(items: List[str], range: str, window: Window, raw: bool, limit: int, db: AsyncSession) -> Dict[str, Any]:
+    start, end = window
+    bucket = series_bucket(range, raw)
+
+    if bucket is None:
+        columns = (Bazaar.timestamp.label("ts"), Bazaar.sell_price, Bazaar.buy_price)
+    else:
+        columns = (
+            bucket_start(bucket).label("ts"),
+            func.avg(Bazaar.sell_price).label("sell_price"),
+            func.avg(Bazaar.buy_price).label("buy_price"),
+        )
+    # One LATERAL page per requested item (repeats dropped), so each reads
+    # at most `limit` index entries however long its history is
+    ids = func.unnest(cast(list(dict.fromkeys(items)), _ITEM_IDS)).table_valued("item_id").render_derived(name="ids")
+    page = series_page(columns, ids.c.item_id, start, end, bucket, limit).lateral("page")
+    q = select(ids.c.item_id, page.c.ts, page.c.sell_price, page.c.buy_price).order_by(ids.c.item_id, page.c.ts)
+    rows = (await db.execute(q)).all()
+
+    if not rows:
+        raise HTTPException(404, f"No bazaar data for items {', '.join(items)}")
+
+    # Every requested item gets a key, empty when it has no data in range
+    result: Dict[str, list] = {item_id: [] for item_id in items}
+    for item_id, ts, sp, bp in rows:
+        result[item_id].append((ts, sp, bp))
+    return {"columns": ["timestamp", "sell_price", "buy_price"], "rows": result}
+
+
+@router.get("/sold/{item_id}", summary="Latest Bazaar summary data")
+async def get_bazaar_sold(item_id: str, db: AsyncSession = Depends(get_db)):
+    latest = (await db.execute(SOLD_STMT, {"item_id": item_id})).first()
+    if not latest:
+        raise HTTPException(404, f"No bazaar data for item {item_id}")
+    return latest.data
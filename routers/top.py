@@ -0,0 +1,76 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import select, bindparam, func, cast, literal, BigInteger, Float
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List
+from pydantic import BaseModel
+from db.models import BazaarLatest
+from cache import cached
+from deps import get_db
+from config import CAPITAL, MARKET_SHARE, SCALING_FACTOR
+
+router = APIRouter()
+
+
+class ItemProfit(BaseModel):
+    item_id: str
+    sell_price: float
+    buy_price: float
+    weekly_volume: float
+    spread: float
+    max_units: int
+    profit_estimate: float
+    roi: float
+
+
+def build_top_stmt():
+    """The /top ranking query; it only varies by `limit`, so it is built once."""
+    # 1) Latest snapshot per item, precomputed by the bazaar_latest view
+    latest = (
+        select(
+            BazaarLatest.product_id.label("item_id"),
+            BazaarLatest.sell_price,
+            BazaarLatest.buy_price,
+            BazaarLatest.sell_moving_week.label("weekly_volume"),
+        )
+        .cte("latest")
+    )
+
+    # 2) Size the position by bankroll and by market share
+    spread = latest.c.buy_price - latest.c.sell_price
+    units_max = cast(
+        func.least(
+            func.floor(literal(CAPITAL, Float) / latest.c.buy_price),
+            func.floor(MARKET_SHARE * latest.c.weekly_volume),
+        ),
+        BigInteger,
+    )
+    scored = (
+        select(latest, spread.label("spread"), units_max.label("max_units"))
+        .where(
+            latest.c.sell_price > 0,
+            latest.c.buy_price > latest.c.sell_price,
+            latest.c.weekly_volume > 0,
+        )
+        .cte("scored")
+    )
+
+    # 3) Rank in the database so only `limit` rows come back
+    profit = scored.c.spread * scored.c.max_units / literal(SCALING_FACTOR, Float)
+    return (
+        select(scored, profit.label("profit_estimate"), (profit / literal(CAPITAL, Float)).label("roi"))
+        .where(scored.c.max_units >= 1)
+        .order_by(profit.desc(), scored.c.item_id)
+        .limit(bindparam("limit"))
+    )
+
+
+TOP_STMT = build_top_stmt()
+
+
+@router.get("/top", response_model=List[ItemProfit], summary="Top N profitable items")
+@cached(expire=60)
+async def get_top(
+    limit: int = Query(10, ge=10, le=200, description="Number of top items to return (10–200)"),
+    db: AsyncSession = Depends(get_db)
+) -> List[ItemProfit]:
+    return (await db.execute(TOP_STMT, {"limit": limit})).mappings().all()